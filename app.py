@@ -1,11 +1,19 @@
 from flask import Flask, render_template, request, jsonify
 import os
 import json
+import queue
+import stat
+import tempfile
 import threading
-import time
-from dotenv import load_dotenv, set_key
+from dotenv import load_dotenv
 from photo_display import main as run_eink_display
 
+# Prefer orjson's C parser when it's installed
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -30,23 +38,17 @@ def receive_token():
     token = data.get('shareToken')
     if token:
         try:
-            dotenv_path = '.env'
-            # Create .env if it doesn't exist
-            if not os.path.exists(dotenv_path):
-                open(dotenv_path, 'a').close()
-            
             # Set the key in the .env file
-            set_key(dotenv_path, 'GOOGLE_PHOTOS_SHARE_TOKEN', token)
+            write_env_value('.env', 'GOOGLE_PHOTOS_SHARE_TOKEN', token)
             
             print(f"\n" + "="*60)
             print(f"  SUCCESS! Saved new Album Share Token to .env file.")
             print(f"  The e-ink display will update with the new album shortly.")
             print("="*60 + "\n")
             
-            # This is a simple way to signal the main loop to reload. 
-            # A more robust solution might use a formal signaling mechanism.
-            global needs_reload
-            needs_reload = True
+            # Hand the new value to the display loop and signal it to reload
+            env_updates.put(('GOOGLE_PHOTOS_SHARE_TOKEN', token))
+            reload_event.set()
             
             return jsonify({'status': 'success'}), 200
         except Exception as e:
@@ -55,39 +57,84 @@ def receive_token():
 
     return jsonify({'status': 'error', 'message': 'No token provided'}), 400
 
+def write_env_value(dotenv_path, key, value):
+    """Sets a single key in the .env file, replacing the file atomically."""
+    lines = []
+    mode = 0o600
+    if os.path.exists(dotenv_path):
+        with open(dotenv_path, 'r') as f:
+            lines = f.read().splitlines()
+        # Keep the original permissions, the file holds API tokens
+        mode = stat.S_IMODE(os.stat(dotenv_path).st_mode)
+    
+    # Replace the existing assignment in place, keeping comments and ordering.
+    # Quotes are escaped the same way python-dotenv's set_key does it.
+    escaped = value.replace("'", "\\'")
+    new_line = f"{key}='{escaped}'"
+    for i, line in enumerate(lines):
+        if line.lstrip().removeprefix('export ').split('=', 1)[0].strip() == key:
+            lines[i] = new_line
+            break
+    else:
+        lines.append(new_line)
+    
+    # Write to a uniquely named temp file and rename it over the original so
+    # a power cut or a concurrent request never leaves a half-written .env
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(dotenv_path)),
+                                    prefix='.env.', suffix='.tmp')
+    try:
+        os.fchmod(fd, mode)
+        with os.fdopen(fd, 'w') as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, dotenv_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+_client_id = None
+
 def get_client_id():
-    """Reads the client ID from the credentials file."""
+    """Reads the client ID from the credentials file, caching it once found."""
+    global _client_id
+    if _client_id:
+        return _client_id
     credentials_file = os.getenv('GOOGLE_PHOTOS_CREDENTIALS_FILE', 'credentials.json')
     if os.path.exists(credentials_file):
-        with open(credentials_file, 'r') as f:
+        with open(credentials_file, 'rb') as f:
             try:
-                data = json.load(f)
-                # Handles both 'installed' and 'web' credential types
-                client_info = data.get('installed', data.get('web'))
-                return client_info.get('client_id')
-            except json.JSONDecodeError:
+                data = json_loads(f.read())
+            except json.JSONDecodeError:  # orjson's decode error subclasses this
                 return None
+        # Handles both 'installed' and 'web' credential types
+        client_info = data.get('installed') or data.get('web') or {}
+        _client_id = client_info.get('client_id')
+        return _client_id
     return None
 
 # --- Main Application Logic ---
 
-needs_reload = False
+# Set by the web server when the display loop should reload its configuration
+reload_event = threading.Event()
+# (key, value) pairs already saved to .env, applied to os.environ on reload
+env_updates = queue.Queue()
 
 def run_display_loop():
     """Wrapper to run the e-ink display and handle reloads."""
-    global needs_reload
     while True:
         print("Starting e-ink display service...")
         # We run the main function from eink_display
         # It will loop internally until a reload is needed
-        run_eink_display(lambda: needs_reload)
+        run_eink_display(reload_event)
         
         # If the function returned, it means a reload is needed
         print("Reloading e-ink display service due to album change...")
-        needs_reload = False
-        # Reload environment variables to get the new token
-        load_dotenv(override=True)
-        time.sleep(5) # Give a moment before restarting
+        reload_event.clear()
+        # Apply the changed values directly instead of re-reading .env
+        while not env_updates.empty():
+            key, value = env_updates.get_nowait()
+            os.environ[key] = value
 
 if __name__ == '__main__':
     # Start the e-ink display loop in a background thread
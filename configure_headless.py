@@ -6,18 +6,30 @@ This script helps set up the service for automatic startup.
 
 import os
 import sys
+import shlex
+import shutil
 import subprocess
 import json
 from pathlib import Path
 
+_STATUS_SYMBOLS = {"INFO": "ℹ️", "SUCCESS": "✅", "WARNING": "⚠️", "ERROR": "❌"}
+
+_MANAGEMENT_COMMANDS = (
+    ("Check status", "sudo systemctl status photo-display.service"),
+    ("View logs", "sudo journalctl -u photo-display.service -f"),
+    ("Stop service", "sudo systemctl stop photo-display.service"),
+    ("Restart service", "sudo systemctl restart photo-display.service"),
+    ("Disable service", "sudo systemctl disable photo-display.service"),
+    ("View recent logs", "sudo journalctl -u photo-display.service --since '1 hour ago'"),
+)
+
 def print_header(title):
     print("\n" + "="*60)
     print(f" {title}")
     print("="*60)
 
 def print_status(message, status="INFO"):
-    symbols = {"INFO": "ℹ️", "SUCCESS": "✅", "WARNING": "⚠️", "ERROR": "❌"}
-    print(f"{symbols.get(status, 'ℹ️')} {message}")
+    print(f"{_STATUS_SYMBOLS.get(status, 'ℹ️')} {message}")
 
 def check_file_exists(filepath, description):
     """Check if a required file exists"""
@@ -69,7 +81,7 @@ def setup_environment():
     
     if not os.path.exists(".env"):
         if os.path.exists(".env.example"):
-            subprocess.run(["cp", ".env.example", ".env"])
+            shutil.copyfile(".env.example", ".env")
             print_status("Created .env from template", "SUCCESS")
         else:
             print_status(".env.example not found", "ERROR")
@@ -113,13 +125,26 @@ def install_service():
         f.write(content)
     
     try:
-        # Install service
-        subprocess.run(["sudo", "cp", updated_service, f"/etc/systemd/system/{service_file}"], check=True)
-        subprocess.run(["sudo", "systemctl", "daemon-reload"], check=True)
-        subprocess.run(["sudo", "systemctl", "enable", service_file], check=True)
+        # Install service (one sudo invocation for all steps)
+        install_cmd = " && ".join([
+            f"cp {shlex.quote(updated_service)} /etc/systemd/system/{service_file}",
+            "systemctl daemon-reload",
+            f"systemctl enable {service_file}",
+        ])
+        subprocess.run(["sudo", "sh", "-c", install_cmd], check=True)
         
         print_status("Service installed and enabled", "SUCCESS")
         
+        # Precompile the app's modules at the service's -OO level so the
+        # first boot loads bytecode instead of compiling sources
+        venv_python = os.path.join(current_dir, ".venv", "bin", "python")
+        if os.path.exists(venv_python):
+            result = subprocess.run([venv_python, "-OO", "-m", "compileall", "-q", "-l", current_dir])
+            if result.returncode == 0:
+                print_status("Precompiled application bytecode", "SUCCESS")
+            else:
+                print_status("Could not precompile bytecode (service will compile on first run)", "WARNING")
+        
         # Clean up
         os.remove(updated_service)
         
@@ -176,16 +201,7 @@ def show_management_commands():
     """Show service management commands"""
     print_header("Service Management Commands")
     
-    commands = [
-        ("Check status", "sudo systemctl status photo-display.service"),
-        ("View logs", "sudo journalctl -u photo-display.service -f"),
-        ("Stop service", "sudo systemctl stop photo-display.service"),
-        ("Restart service", "sudo systemctl restart photo-display.service"),
-        ("Disable service", "sudo systemctl disable photo-display.service"),
-        ("View recent logs", "sudo journalctl -u photo-display.service --since '1 hour ago'"),
-    ]
-    
-    for description, command in commands:
+    for description, command in _MANAGEMENT_COMMANDS:
         print(f"• {description:15}: {command}")
 
 def main():
@@ -1,14 +1,31 @@
 import json
 import os
+import functools
 import requests
 
+# Prefer orjson's C parser when it's installed
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 TOKEN_FILE = 'token.json'
 
+# Shared session so repeated calls reuse the connection pool
+SESSION = requests.Session()
+
 def print_header(title):
     print("\n" + "="*60)
     print(f" {title}")
     print("="*60)
 
+@functools.lru_cache(maxsize=1)
+def get_access_token():
+    """Loads the access token from the token file once per process."""
+    with open(TOKEN_FILE, 'rb') as f:
+        token_data = json_loads(f.read())
+    return token_data.get('token')
+
 def main():
     """A simple, direct API call to fetch photos, bypassing the Google client library."""
     print_header("Direct Google Photos API Fetch Test")
@@ -18,10 +35,7 @@ def main():
         return
 
     try:
-        with open(TOKEN_FILE, 'r') as f:
-            token_data = json.load(f)
-        
-        access_token = token_data.get('token')
+        access_token = get_access_token()
         if not access_token:
             print("ERROR: Could not find 'token' in token.json.")
             return
@@ -31,13 +45,11 @@ def main():
         return
 
     api_url = 'https://photoslibrary.googleapis.com/v1/mediaItems?pageSize=10'
-    headers = {
-        'Authorization': f'Bearer {access_token}',
-    }
+    SESSION.headers['Authorization'] = f'Bearer {access_token}'
 
     print(f"\nMaking a direct GET request to fetch photos...")
     try:
-        response = requests.get(api_url, headers=headers, timeout=30)
+        response = SESSION.get(api_url, timeout=30)
 
         print_header("API Response")
         print(f"Status Code: {response.status_code}")
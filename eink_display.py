@@ -1,57 +1,171 @@
 import os
 import time
-import json
 import logging
-import schedule
+import threading
+import functools
 from datetime import datetime
 from PIL import Image, ImageDraw, ImageFont
-import requests
 from dotenv import load_dotenv
-import numpy as np
-from waveshare_epd import epd4in01f, epdconfig
-
-# Load environment variables
-load_dotenv()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# strftime formats shared by the header and the minute tracking
+TIME_FORMAT = "%I:%M %p"  # 12-hour format with AM/PM
+DATE_FORMAT = "%A, %B %d"
+
+# Ecowitt sensors shown on the display
+WEATHER_ENTITIES = (
+    "sensor.gw1200b_outdoor_temperature",
+    "sensor.gw1200b_humidity",
+    "sensor.gw1200b_wind_speed",
+    "sensor.gw1200b_wind_gust",
+    "sensor.gw1200b_daily_rain_piezo",
+    "sensor.gw1200b_feels_like_temperature",
+)
+
+# Palette indices used as draw colors
+BLACK = 0
+WHITE = 1
+
+# 7-color ACeP palette in the controller's index order (black, white, green,
+# blue, red, yellow, orange), padded to the 256 entries Pillow expects
+PALETTE = (
+    0, 0, 0, 255, 255, 255, 0, 255, 0, 0, 0, 255,
+    255, 0, 0, 255, 255, 0, 255, 128, 0,
+) + (0, 0, 0) * 249
+
+def readings_differ(a, b, tolerance=0.5):
+    """Compare two sensor states numerically, so "7" and "7.0" count as equal"""
+    try:
+        return abs(float(a) - float(b)) >= tolerance
+    except ValueError:
+        return a != b
+
+@functools.lru_cache(maxsize=2)
+def format_minute(minute):
+    """Time and date strings for a datetime truncated to the minute"""
+    return minute.strftime(TIME_FORMAT), minute.strftime(DATE_FORMAT)
+
+@functools.lru_cache(maxsize=32)
+def load_font(path, size):
+    """Load a TrueType font once per path and size, shared by every display instance"""
+    return ImageFont.truetype(path, size)
+
+@functools.lru_cache(maxsize=256)
+def measure_text(text, font):
+    """Rendered width of text in font, memoized since most strings repeat every update"""
+    return font.getlength(text)
+
 class EInkDisplay:
+    # Layout margins and sections
+    MARGIN = 15
+    HEADER_HEIGHT = 60  # Reduced from 70
+    TEMP_SECTION_Y = HEADER_HEIGHT + 30
+    TEMP_SECTION_HEIGHT = 90  # Optimized height
+    WIND_SECTION_Y = TEMP_SECTION_Y + TEMP_SECTION_HEIGHT + 15
+    WIND_SECTION_HEIGHT = 85  # Optimized spacing
+    RAIN_SECTION_Y = WIND_SECTION_Y + WIND_SECTION_HEIGHT + 15
+    RAIN_SECTION_HEIGHT = 85  # Optimized spacing
+    
+    # Canvas fill; text drawn in this color would be invisible
+    BACKGROUND_COLOR = WHITE
+    
+    # Seconds a fetched Home Assistant state is reused before polling again
+    HA_CACHE_TTL = 60
+    # Waveshare's minimum time between refreshes of this panel
+    MIN_REFRESH_INTERVAL = 180
+    # Seconds between scheduled weather updates: starts at UPDATE_INTERVAL,
+    # drops to the minimum when readings change and backs off while they're steady
+    UPDATE_INTERVAL = 5 * 60
+    MIN_UPDATE_INTERVAL = MIN_REFRESH_INTERVAL
+    MAX_UPDATE_INTERVAL = 30 * 60
+    UPDATE_BACKOFF = 1.5
+    # Redraw the panel at least this often, even if nothing changed, to clear ghosting
+    FULL_REFRESH_INTERVAL = 60 * 60
+    
+    # (connect, read) timeouts for Home Assistant requests
+    HA_TIMEOUT = (3.05, 8)
+    
     def __init__(self):
+        # Deferred so importing this module doesn't pull in the SPI/GPIO driver stack
+        from waveshare_epd import epd4in01f
         self.epd = epd4in01f.EPD()
         self.width = self.epd.width
         self.height = self.epd.height
+        # Centers of the left and right columns, fixed for the panel size
+        self.left_x = self.width // 4
+        self.right_x = 3 * self.width // 4
         
         # Load fonts with improved sizes for better space utilization
         try:
-            self.font_xlarge = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 48)
-            self.font_large_details = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 38)  # 80% of xlarge
-            self.font_large = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 36)
-            self.font_humidity = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 34)  # 70% of xlarge
-            self.font_medium = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 28)
-            self.font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 22)
-            self.font_tiny = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 18)
+            self.font_xlarge = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 48)
+            self.font_large_details = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 38)  # 80% of xlarge
+            self.font_large = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 36)
+            self.font_humidity = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 34)  # 70% of xlarge
+            self.font_medium = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 28)
+            self.font_small = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 22)
+            self.font_tiny = load_font("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 18)
         except OSError:
             # Fallback to default fonts if system fonts not available
-            self.font_xlarge = ImageFont.load_default()
-            self.font_large_details = ImageFont.load_default()
-            self.font_large = ImageFont.load_default()
-            self.font_humidity = ImageFont.load_default()
-            self.font_medium = ImageFont.load_default()
-            self.font_small = ImageFont.load_default()
-            self.font_tiny = ImageFont.load_default()
+            default_font = ImageFont.load_default()
+            self.font_xlarge = default_font
+            self.font_large_details = default_font
+            self.font_large = default_font
+            self.font_humidity = default_font
+            self.font_medium = default_font
+            self.font_small = default_font
+            self.font_tiny = default_font
         
         # Load environment variables
         self.homeassistant_url = os.getenv('HOME_ASSISTANT_URL')
         self.homeassistant_token = os.getenv('HOME_ASSISTANT_TOKEN')
+        # Checked once here rather than on every fetch
+        self.ha_configured = bool(self.homeassistant_url and self.homeassistant_token)
+        if not self.ha_configured:
+            logger.warning("Home Assistant credentials not configured")
+        
+        # Reuse one pooled, keep-alive connection for Home Assistant polling
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        self._requests = requests
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                              max_retries=Retry(total=2, backoff_factor=0.3))
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers.update({
+            "Authorization": f"Bearer {self.homeassistant_token}",
+            "content-type": "application/json",
+        })
+        self._ha_cache = {}  # entity_id -> (fetched_at, state)
         
         # Track last content to avoid unnecessary updates
         self.last_content_hash = None
         self.update_count = 0
         self.last_minute = None
         self.last_weather_hash = None
-        self.last_partial_update_time = 0  # Track last partial update for 180s minimum interval
+        self.last_full_update_time = float("-inf")  # Monotonic time of last panel refresh
+        self.last_partial_update_time = float("-inf")  # Monotonic time of last partial update, for the 180s minimum interval
+        self._stop = threading.Event()  # Set to make run() return
+        self.update_interval = self.UPDATE_INTERVAL
+        
+        # Panel palette and packed framebuffer, reused across updates
+        self._palette_image = Image.new('P', (1, 1))
+        self._palette_image.putpalette(PALETTE)
+        self._framebuffer = None
+        self._framebuffer_view = None
+        
+        # Border, section boxes and labels never change, so draw them once
+        # for each wind layout (keyed by whether the gust column is shown)
+        self._base_images = {
+            show_gust: self.render_base_image(show_gust) for show_gust in (False, True)
+        }
+        # Working frame and its draw context, refilled from a base image on each update
+        self._frame = self._base_images[False].copy()
+        self._frame_draw = ImageDraw.Draw(self._frame)
         
     def init_display(self):
         """Initialize the e-ink display"""
@@ -65,54 +179,161 @@ class EInkDisplay:
         logger.info("Clearing display...")
         self.epd.Clear()
         
+    def get_cached_entity(self, entity_id, now):
+        """Return the cached state for entity_id if it is still within its TTL"""
+        fetched_at, state = self._ha_cache.get(entity_id, (0, None))
+        if state is not None and now - fetched_at < self.HA_CACHE_TTL:
+            return state
+        return None
+        
     def get_homeassistant_entity(self, entity_id):
         """Fetch entity state from Home Assistant"""
-        if not all([self.homeassistant_url, self.homeassistant_token]):
-            logger.warning("Home Assistant credentials not configured")
+        if not self.ha_configured:
             return None
-            
-        headers = {
-            "Authorization": f"Bearer {self.homeassistant_token}",
-            "content-type": "application/json",
-        }
+        
+        cached = self.get_cached_entity(entity_id, time.monotonic())
+        if cached is not None:
+            return cached
         
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{self.homeassistant_url}/api/states/{entity_id}",
-                headers=headers,
-                timeout=10
+                timeout=self.HA_TIMEOUT
             )
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            data = response.json()
+            self._ha_cache[entity_id] = (time.monotonic(), data)
+            return data
+        except self._requests.exceptions.RequestException as e:
             logger.error(f"Error fetching from Home Assistant: {e}")
             return None
     
+    def get_homeassistant_entities(self, entity_ids):
+        """Fetch several entity states from Home Assistant with a single request"""
+        if not self.ha_configured:
+            return {}
+        
+        # Serve straight from the cache while every requested entity is fresh
+        now = time.monotonic()
+        cached = {}
+        for entity_id in entity_ids:
+            state = self.get_cached_entity(entity_id, now)
+            if state is None:
+                break
+            cached[entity_id] = state
+        else:
+            return cached
+        
+        try:
+            response = self._session.get(
+                f"{self.homeassistant_url}/api/states",
+                timeout=self.HA_TIMEOUT
+            )
+            response.raise_for_status()
+            wanted = set(entity_ids)
+            states = {state['entity_id']: state for state in response.json()
+                      if state.get('entity_id') in wanted}
+            fetched_at = time.monotonic()
+            for entity_id, state in states.items():
+                self._ha_cache[entity_id] = (fetched_at, state)
+            return states
+        except self._requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching from Home Assistant: {e}")
+            return {}
+    
     def draw_centered_text(self, draw, y, text, font, color=0):
         """Draw centered text on the image"""
-        text_width = draw.textlength(text, font=font)
+        if color == self.BACKGROUND_COLOR:
+            return
+        text_width = measure_text(text, font)
         x = (self.width - text_width) // 2
         draw.text((x, y), text, font=font, fill=color)
         
     def draw_left_aligned_text(self, draw, x, y, text, font, color=0):
         """Draw left-aligned text on the image"""
+        if color == self.BACKGROUND_COLOR:
+            return
         draw.text((x, y), text, font=font, fill=color)
         
     def draw_right_aligned_text(self, draw, x, y, text, font, color=0):
         """Draw right-aligned text on the image"""
-        text_width = draw.textlength(text, font=font)
+        if color == self.BACKGROUND_COLOR:
+            return
+        text_width = measure_text(text, font)
         draw.text((x - text_width, y), text, font=font, fill=color)
         
     def draw_horizontal_line(self, draw, y, color=0, thickness=2):
         """Draw a horizontal line across the width"""
-        for i in range(thickness):
-            draw.line([(10, y + i), (self.width - 10, y + i)], fill=color)
+        draw.rectangle([10, y, self.width - 10, y + thickness - 1], fill=color)
             
     def draw_section_box(self, draw, x, y, width, height, color=0, thickness=2):
         """Draw a rectangular border"""
-        for i in range(thickness):
-            draw.rectangle([x + i, y + i, x + width - i, y + height - i], outline=color, fill=None)
-            
+        draw.rectangle([x, y, x + width, y + height], outline=color, width=thickness)
+            
+    def render_base_image(self, show_gust):
+        """Render the static chrome shared by every full update"""
+        # Drawn directly in the panel palette so no color conversion is needed later
+        image = Image.new('P', (self.width, self.height), self.BACKGROUND_COLOR)
+        image.putpalette(PALETTE)
+        draw = ImageDraw.Draw(image)
+        margin = self.MARGIN
+        left_x = self.left_x
+        right_x = self.right_x
+        
+        # Draw main border around entire display
+        self.draw_section_box(draw, 5, 5, self.width - 10, self.height - 10, 0, 3)
+        
+        # Header label and the line under it
+        self.draw_left_aligned_text(draw, 20, 15, "Updated", self.font_tiny, 0)
+        self.draw_horizontal_line(draw, self.HEADER_HEIGHT + 10, 0, 2)
+        
+        # Section boxes
+        for section_y, section_height in (
+            (self.TEMP_SECTION_Y, self.TEMP_SECTION_HEIGHT),
+            (self.WIND_SECTION_Y, self.WIND_SECTION_HEIGHT),
+            (self.RAIN_SECTION_Y, self.RAIN_SECTION_HEIGHT),
+        ):
+            self.draw_section_box(draw, margin, section_y, self.width - 2*margin, section_height, 0, 2)
+        
+        # Column labels
+        labels = [
+            ("ACTUAL", left_x, self.TEMP_SECTION_Y),
+            ("FEELS LIKE", right_x, self.TEMP_SECTION_Y),
+            ("RAIN", left_x, self.RAIN_SECTION_Y),
+            ("HUMIDITY", right_x, self.RAIN_SECTION_Y),
+        ]
+        if show_gust:
+            labels += [("WIND", left_x, self.WIND_SECTION_Y), ("GUST", right_x, self.WIND_SECTION_Y)]
+        else:
+            self.draw_centered_text(draw, self.WIND_SECTION_Y + 10, "WIND", self.font_tiny, 0)
+        for label, column_x, section_y in labels:
+            label_width = measure_text(label, self.font_tiny)
+            self.draw_left_aligned_text(draw, column_x - label_width // 2, section_y + 10, label, self.font_tiny, 0)
+        
+        return image
+        
+    def get_framebuffer(self, image):
+        """Pack an image into the 4-bit-per-pixel buffer expected by epd.display.
+        
+        Same output as epd.getbuffer, but the nibble packing is done with NumPy
+        instead of the driver's per-pixel Python loop. Images already drawn in
+        the panel palette (mode 'P') are packed as-is. The returned bytearray is
+        reused (and overwritten) by the next call.
+        """
+        import numpy as np
+        
+        if self._framebuffer is None:
+            self._framebuffer = bytearray(self.width * self.height // 2)
+            self._framebuffer_view = np.frombuffer(self._framebuffer, dtype=np.uint8).reshape(
+                self.height, self.width // 2)
+        
+        if image.mode != 'P':
+            image = image.convert('RGB').quantize(palette=self._palette_image)
+        indices = np.asarray(image, dtype=np.uint8)
+        np.left_shift(indices[:, 0::2], 4, out=self._framebuffer_view)
+        np.bitwise_or(self._framebuffer_view, indices[:, 1::2], out=self._framebuffer_view)
+        return self._framebuffer
+        
     def get_weather_icon(self, temp, humidity, wind_speed, rain):
         """Get a simple text-based weather icon"""
         try:
@@ -139,9 +360,9 @@ class EInkDisplay:
     def update_time_only(self):
         """Time update every 10 minutes - respects 180-second minimum interval"""
         try:
-            now = datetime.now()
-            current_minute = now.strftime("%I:%M %p")
-            current_time = time.time()
+            now = datetime.now().replace(second=0, microsecond=0)
+            current_minute, _ = format_minute(now)
+            current_time = time.monotonic()
             
             # Only check for updates every 10 minutes (when minute ends in 0)
             if now.minute % 10 != 0:
@@ -153,15 +374,12 @@ class EInkDisplay:
             
             # Check 180-second minimum interval (Waveshare requirement)
             time_since_last_update = current_time - self.last_partial_update_time
-            if time_since_last_update < 180:
-                logger.info(f"Skipping time update - only {time_since_last_update:.1f}s since last update (need 180s minimum)")
+            if time_since_last_update < self.MIN_REFRESH_INTERVAL:
+                logger.info(f"Skipping time update - only {time_since_last_update:.1f}s since last update (need {self.MIN_REFRESH_INTERVAL}s minimum)")
                 return
             
-            time_str = now.strftime("%I:%M %p")
-            date_str = now.strftime("%A, %B %d")
-            
             # Since partial updates aren't supported, do a full display update every 10 minutes
-            logger.info(f"Time update triggered (every 10 minutes): {time_str}")
+            logger.info(f"Time update triggered (every 10 minutes): {current_minute}")
             
             # Update tracking variables
             self.last_minute = current_minute
@@ -176,39 +394,17 @@ class EInkDisplay:
     def update_display(self):
         """Update the display with current information"""
         try:
-            # Create a new image with white background
-            image = Image.new('RGB', (self.width, self.height), 'white')
-            draw = ImageDraw.Draw(image)
-            
-            # Define layout margins and sections
-            margin = 15
-            header_height = 60  # Reduced from 70
-            main_section_y = header_height + 30
-            
-            # Get current time
-            now = datetime.now()
-            time_str = now.strftime("%I:%M %p")  # 12-hour format with AM/PM
-            date_str = now.strftime("%A, %B %d")
-            update_time = now.strftime("%I:%M %p")
-            
-            # === HEADER SECTION ===
-            # Draw main border around entire display
-            self.draw_section_box(draw, 5, 5, self.width - 10, self.height - 10, 0, 3)
-            
-            # Draw "Updated" with time and date
-            self.draw_left_aligned_text(draw, 20, 15, "Updated", self.font_tiny, 0)
-            self.draw_left_aligned_text(draw, 20, 35, f"{time_str} {date_str}", self.font_medium, 0)
-            
-            # Draw horizontal line under header
-            self.draw_horizontal_line(draw, header_height + 10, 0, 2)
-            
-            # Get Ecowitt weather data
-            temp_data = self.get_homeassistant_entity("sensor.gw1200b_outdoor_temperature")
-            humidity_data = self.get_homeassistant_entity("sensor.gw1200b_humidity")
-            wind_speed_data = self.get_homeassistant_entity("sensor.gw1200b_wind_speed")
-            wind_gust_data = self.get_homeassistant_entity("sensor.gw1200b_wind_gust")
-            daily_rain_data = self.get_homeassistant_entity("sensor.gw1200b_daily_rain_piezo")
-            feels_like_data = self.get_homeassistant_entity("sensor.gw1200b_feels_like_temperature")
+            # Get current time (formatted once per minute)
+            time_str, date_str = format_minute(datetime.now().replace(second=0, microsecond=0))
+            
+            # Get Ecowitt weather data (one request for all sensors)
+            states = self.get_homeassistant_entities(WEATHER_ENTITIES)
+            temp_data = states.get("sensor.gw1200b_outdoor_temperature")
+            humidity_data = states.get("sensor.gw1200b_humidity")
+            wind_speed_data = states.get("sensor.gw1200b_wind_speed")
+            wind_gust_data = states.get("sensor.gw1200b_wind_gust")
+            daily_rain_data = states.get("sensor.gw1200b_daily_rain_piezo")
+            feels_like_data = states.get("sensor.gw1200b_feels_like_temperature")
             
             # Extract values with fallbacks
             temp = temp_data.get('state', 'N/A') if temp_data else 'N/A'
@@ -226,170 +422,154 @@ class EInkDisplay:
             
             feels_like = feels_like_data.get('state', 'N/A') if feels_like_data else 'N/A'
             
-            # === MAIN TEMPERATURE SECTION ===
-            temp_section_y = main_section_y
-            temp_section_height = 90  # Optimized height
-            
-            # Draw temperature section box
-            self.draw_section_box(draw, margin, temp_section_y, self.width - 2*margin, temp_section_height, 0, 2)
-            
-            # Draw temperature and feels-like side by side (no humidity here)
+            # Temperature and feels-like are shown side by side (no humidity here)
             temp_line = f"{temp}{temp_unit}"
             feels_line = f"{feels_like}{temp_unit}" if feels_like != 'N/A' else f"{temp}{temp_unit}"
             
-            # Calculate positions for two-column layout
-            quarter_width = self.width // 4
-            temp_x = quarter_width
-            feels_x = 3 * quarter_width
+            # Create content hash for weather data only (excluding time).
+            # Only equality matters here, so the builtin tuple hash is enough.
+            weather_hash = hash((temp_line, humidity, wind_speed, wind_gust, daily_rain, feels_like))
+            
+            # Always update the content hash for comparison
+            content_hash = hash((time_str, date_str, weather_hash))
+            self.last_content_hash = content_hash
+            
+            # Check if weather data has changed
+            weather_changed = self.last_weather_hash != weather_hash
+            
+            # Poll sooner while readings are moving, back off while they're steady
+            if weather_changed:
+                self.update_interval = self.MIN_UPDATE_INTERVAL
+            else:
+                self.update_interval = min(self.update_interval * self.UPDATE_BACKOFF, self.MAX_UPDATE_INTERVAL)
+            
+            # Force a full update once the panel has gone long enough without one
+            force_full_update = time.monotonic() - self.last_full_update_time >= self.FULL_REFRESH_INTERVAL
+            
+            # Bail out before allocating and drawing a frame that won't be shown
+            if not (weather_changed or force_full_update):
+                logger.info("Weather unchanged, skipping full display update")
+                return
+            
+            # Never refresh the panel faster than it allows, whoever asked for the update
+            since_last_refresh = time.monotonic() - self.last_full_update_time
+            if since_last_refresh < self.MIN_REFRESH_INTERVAL:
+                logger.info(f"Deferring display update - only {since_last_refresh:.1f}s since last refresh (need {self.MIN_REFRESH_INTERVAL}s minimum)")
+                return
+            
+            # Two columns only when there is a distinct gust reading
+            show_gust = wind_gust != 'N/A' and readings_differ(wind_gust, wind_speed)
+            
+            # Start from the pre-rendered chrome and draw only the readings
+            image = self._frame
+            image.paste(self._base_images[show_gust])
+            draw = self._frame_draw
+            
+            # === HEADER SECTION ===
+            self.draw_left_aligned_text(draw, 20, 35, f"{time_str} {date_str}", self.font_medium, 0)
+            
+            # === MAIN TEMPERATURE SECTION ===
+            temp_section_y = self.TEMP_SECTION_Y
+            
+            # Two-column layout positions
+            temp_x = self.left_x
+            feels_x = self.right_x
             
             # Always show both actual and feels-like with labels for consistency
             # Draw temperature on left side
-            temp_width = draw.textlength(temp_line, font=self.font_xlarge)
+            temp_width = measure_text(temp_line, self.font_xlarge)
             temp_start_x = temp_x - temp_width // 2
             self.draw_left_aligned_text(draw, temp_start_x, temp_section_y + 40, temp_line, self.font_xlarge, 0)
             
             # Draw feels-like on right side
-            feels_width = draw.textlength(feels_line, font=self.font_xlarge)
+            feels_width = measure_text(feels_line, self.font_xlarge)
             feels_start_x = feels_x - feels_width // 2
             self.draw_left_aligned_text(draw, feels_start_x, temp_section_y + 40, feels_line, self.font_xlarge, 0)
             
-            # Add labels
-            temp_label_width = draw.textlength("ACTUAL", font=self.font_tiny)
-            temp_label_x = temp_x - temp_label_width // 2
-            self.draw_left_aligned_text(draw, temp_label_x, temp_section_y + 10, "ACTUAL", self.font_tiny, 0)
-            
-            feels_label_width = draw.textlength("FEELS LIKE", font=self.font_tiny)
-            feels_label_x = feels_x - feels_label_width // 2
-            self.draw_left_aligned_text(draw, feels_label_x, temp_section_y + 10, "FEELS LIKE", self.font_tiny, 0)
-            
             # === WIND SECTION ===
-            wind_section_y = temp_section_y + temp_section_height + 15
-            wind_section_height = 85  # Optimized spacing
-            
-            # Draw wind section box
-            self.draw_section_box(draw, margin, wind_section_y, self.width - 2*margin, wind_section_height, 0, 2)
+            wind_section_y = self.WIND_SECTION_Y
             
             # Format wind display as x.x / y.y mph
-            if wind_gust != 'N/A' and wind_gust != wind_speed:
+            if show_gust:
                 # Two column layout for wind and gust
-                wind_x = self.width // 4
-                gust_x = 3 * self.width // 4
+                wind_x = self.left_x
+                gust_x = self.right_x
                 
                 # Draw wind speed
                 wind_value = f"{wind_speed} {wind_unit}"
-                wind_width = draw.textlength(wind_value, font=self.font_large_details)
+                wind_width = measure_text(wind_value, self.font_large_details)
                 wind_start_x = wind_x - wind_width // 2
                 self.draw_left_aligned_text(draw, wind_start_x, wind_section_y + 40, wind_value, self.font_large_details, 0)
                 
                 # Draw gust speed
                 gust_value = f"{wind_gust} {wind_unit}"
-                gust_width = draw.textlength(gust_value, font=self.font_large_details)
+                gust_width = measure_text(gust_value, self.font_large_details)
                 gust_start_x = gust_x - gust_width // 2
                 self.draw_left_aligned_text(draw, gust_start_x, wind_section_y + 40, gust_value, self.font_large_details, 0)
-                
-                # Add labels
-                wind_label_width = draw.textlength("WIND", font=self.font_tiny)
-                wind_label_x = wind_x - wind_label_width // 2
-                self.draw_left_aligned_text(draw, wind_label_x, wind_section_y + 10, "WIND", self.font_tiny, 0)
-                
-                gust_label_width = draw.textlength("GUST", font=self.font_tiny)
-                gust_label_x = gust_x - gust_label_width // 2
-                self.draw_left_aligned_text(draw, gust_label_x, wind_section_y + 10, "GUST", self.font_tiny, 0)
             else:
                 # Single wind value centered
                 wind_value = f"{wind_speed} {wind_unit}"
                 self.draw_centered_text(draw, wind_section_y + 45, wind_value, self.font_large_details, 0)
-                
-                # Add label
-                self.draw_centered_text(draw, wind_section_y + 10, "WIND", self.font_tiny, 0)
             
             # === RAIN AND HUMIDITY SECTION ===
-            rain_section_y = wind_section_y + wind_section_height + 15
-            rain_section_height = 85  # Optimized spacing
-            
-            # Draw rain/humidity section box
-            self.draw_section_box(draw, margin, rain_section_y, self.width - 2*margin, rain_section_height, 0, 2)
+            rain_section_y = self.RAIN_SECTION_Y
             
             # Two column layout for rain and humidity
-            rain_x = self.width // 4
-            humidity_x = 3 * self.width // 4
+            rain_x = self.left_x
+            humidity_x = self.right_x
             
             # Draw rain value
             rain_value = f"{daily_rain} {rain_unit}"
-            rain_width = draw.textlength(rain_value, font=self.font_large_details)
+            rain_width = measure_text(rain_value, self.font_large_details)
             rain_start_x = rain_x - rain_width // 2
             self.draw_left_aligned_text(draw, rain_start_x, rain_section_y + 45, rain_value, self.font_large_details, 0)
             
             # Draw humidity value
             humidity_value = f"{humidity}%"
-            humidity_width = draw.textlength(humidity_value, font=self.font_large_details)
+            humidity_width = measure_text(humidity_value, self.font_large_details)
             humidity_start_x = humidity_x - humidity_width // 2
             self.draw_left_aligned_text(draw, humidity_start_x, rain_section_y + 45, humidity_value, self.font_large_details, 0)
             
-            # Add labels
-            rain_label_width = draw.textlength("RAIN", font=self.font_tiny)
-            rain_label_x = rain_x - rain_label_width // 2
-            self.draw_left_aligned_text(draw, rain_label_x, rain_section_y + 10, "RAIN", self.font_tiny, 0)
-            
-            humidity_label_width = draw.textlength("HUMIDITY", font=self.font_tiny)
-            humidity_label_x = humidity_x - humidity_label_width // 2
-            self.draw_left_aligned_text(draw, humidity_label_x, rain_section_y + 10, "HUMIDITY", self.font_tiny, 0)
-            
-            # Create content hash for weather data only (excluding time)
-            weather_string = f"{temp_line}|{humidity}|{wind_speed}|{daily_rain}|{feels_like}"
-            import hashlib
-            weather_hash = hashlib.md5(weather_string.encode()).hexdigest()
-            
-            # Check if weather data has changed
-            weather_changed = self.last_weather_hash != weather_hash
-            
-            # Force full update every 20th update for display refresh
-            force_full_update = self.update_count % 20 == 0
-            
-            if weather_changed or force_full_update:
-                # Full update needed
-                self.epd.display(self.epd.getbuffer(image))
-                self.last_weather_hash = weather_hash
-                self.last_minute = now.strftime("%I:%M %p")  # Update time tracking
-                self.update_count += 1
-                logger.info(f"Full display update (update #{self.update_count})")
-            else:
-                logger.info("Weather unchanged, skipping full display update")
-            
-            # Always update the content hash for comparison
-            content_string = f"{time_str}|{date_str}|{temp_line}|{humidity}|{wind_speed}|{daily_rain}|{feels_like}"
-            self.last_content_hash = hashlib.md5(content_string.encode()).hexdigest()
+            # Full update needed
+            self.push_frame(self.get_framebuffer(image), weather_hash, time_str)
             
         except Exception as e:
             logger.error(f"Error updating display: {e}")
+    
+    def push_frame(self, buffer, weather_hash, time_str):
+        """Send a packed frame to the panel and record what is now shown"""
+        self.epd.display(buffer)
+        self.last_weather_hash = weather_hash
+        self.last_minute = time_str  # Update time tracking
+        self.update_count += 1
+        self.last_full_update_time = time.monotonic()
+        logger.info(f"Full display update (update #{self.update_count})")
             
     def run(self):
         """Main loop for the display"""
+        from waveshare_epd import epdconfig
+        
         logger.info("Starting e-ink display application")
         self.init_display()
         
-        # Schedule updates
-        schedule.every(5).minutes.do(self.update_display)  # Full weather update every 5 minutes
-        
         # Initial update
         self.update_display()
-        
-        last_minute_check = None
+        next_update = time.monotonic() + self.update_interval
         
         try:
             while True:
-                # Check for scheduled weather updates
-                schedule.run_pending()
-                
-                # Manual minute checking for more reliable time updates
-                now = datetime.now()
-                current_minute = now.strftime("%I:%M %p")
+                # Sleep until the next weather update or minute boundary, whichever comes first
+                until_next_minute = 60 - time.time() % 60
+                timeout = max(0, min(next_update - time.monotonic(), until_next_minute))
+                if self._stop.wait(timeout):
+                    break
                 
-                if last_minute_check != current_minute:
-                    self.update_time_only()
-                    last_minute_check = current_minute
+                if time.monotonic() >= next_update:
+                    self.update_display()
+                    next_update = time.monotonic() + self.update_interval
                 
-                time.sleep(10)  # Check every 10 seconds instead of every second
+                # Time check on each minute boundary
+                self.update_time_only()
                 
         except KeyboardInterrupt:
             logger.info("Shutting down due to KeyboardInterrupt...")
@@ -397,8 +577,15 @@ class EInkDisplay:
             logger.error(f"An unexpected error occurred: {e}")
         finally:
             logger.info("Cleaning up GPIO and putting display to sleep...")
+            self._session.close()
             epdconfig.module_exit()
+    
+    def stop(self):
+        """Ask run() to exit at its next wakeup"""
+        self._stop.set()
 
 if __name__ == "__main__":
+    # Load environment variables (importers are expected to have done this already)
+    load_dotenv()
     display = EInkDisplay()
     display.run()
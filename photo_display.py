@@ -1,11 +1,10 @@
 import os
-import time
 import logging
 import schedule
+import threading
 import io
 from datetime import datetime
 from PIL import Image, ImageDraw, ImageFont, ImageOps
-from dotenv import load_dotenv
 from google_photos_service import GooglePhotosService
 
 # Configure logging
@@ -89,18 +88,23 @@ def display_message(message):
     except Exception as e:
         logging.error(f"Error displaying message: {e}")
 
-def main(reload_check=lambda: False):
-    """Main loop for the e-ink photo display service."""
+def main(reload_event=None):
+    """Main loop for the e-ink photo display service.
+
+    Returns once reload_event (a threading.Event) is set; without one it runs forever.
+    """
+    if reload_event is None:
+        reload_event = threading.Event()
+
     display_message("Starting up Photo Frame...")
     
-    load_dotenv(override=True)
-    
+    # The environment is loaded by the caller (app.py / run_display.py),
+    # including the reload after an album change
     photos_service = GooglePhotosService()
     if not photos_service.authenticate():
         logging.error("Authentication failed. Stopping display loop.")
         display_message("Authentication Failed.\nCheck .env and token files.")
-        while not reload_check():
-            time.sleep(5)
+        reload_event.wait()
         return
 
     def update_photo_job():
@@ -114,12 +118,14 @@ def main(reload_check=lambda: False):
 
     update_photo_job()
 
+    # Use a private scheduler so jobs don't pile up across reloads
+    scheduler = schedule.Scheduler()
     update_interval = int(os.getenv('UPDATE_INTERVAL_MINUTES', 30))
-    schedule.every(update_interval).minutes.do(update_photo_job)
+    scheduler.every(update_interval).minutes.do(update_photo_job)
     logging.info(f"Scheduled to update photo every {update_interval} minutes.")
 
-    while not reload_check():
-        schedule.run_pending()
-        time.sleep(1)
+    # Block until the next job is due, waking early if a reload is requested
+    while not reload_event.wait(max(scheduler.idle_seconds, 0)):
+        scheduler.run_pending()
     
     logging.info("Reload signal received. Exiting display loop.")
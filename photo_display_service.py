@@ -82,13 +82,12 @@ class PhotoDisplayService:
             
             # Draw border around photo
             border_thickness = 2
-            for i in range(border_thickness):
-                draw.rectangle([
-                    photo_x - i - 1, 
-                    photo_y - i - 1, 
-                    photo_x + photo_display.width + i, 
-                    photo_y + photo_display.height + i
-                ], outline=0, fill=None)
+            draw.rectangle([
+                photo_x - border_thickness,
+                photo_y - border_thickness,
+                photo_x + photo_display.width + border_thickness - 1,
+                photo_y + photo_display.height + border_thickness - 1
+            ], outline=0, width=border_thickness)
             
             # Draw separator line
             separator_y = photo_area_height + 10